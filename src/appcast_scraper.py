@@ -1,54 +1,195 @@
-import calendar
+import html
 import json
 import os
-from datetime import datetime, timedelta
+import re
+import shutil
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlencode
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode, urljoin, urlsplit
 
-from playwright.sync_api import sync_playwright
-import requests  # für den Make-Webhook
+# playwright, requests und calendar werden erst in den Funktionen importiert,
+# die sie brauchen: Konfiguration/Datumslogik laden so ohne Playwright-Import,
+# und Chromium-Treiber werden nur beim Fallback-Login überhaupt geladen.
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import orjson  # deutlich schneller als json, aber optional
+except ImportError:
+    orjson = None
 
 BASE_URL = "https://appcast-de.appcast.io"
 LOGIN_URL = f"{BASE_URL}/cc/user-sessions/login"
+USER_INFO_PATH = "/api/info/user"
+
+# Rails-Login-Formular: CSRF-Token (Hidden-Field oder Meta-Tag), Formulare
+# samt Inhalt (gesucht wird das mit den user_session-Feldern) und Form-Action
+CSRF_TOKEN_RE = re.compile(
+    r'name="(?:authenticity_token|csrf-token)"[^>]*(?:value|content)="([^"]+)"'
+)
+FORM_RE = re.compile(r"<form\b([^>]*)>(.*?)</form>", re.IGNORECASE | re.DOTALL)
+FORM_ACTION_RE = re.compile(r'\baction="([^"]*)"', re.IGNORECASE)
 DEFAULT_EMPLOYER_ID = "27620"
 
+# Timeout (Sekunden) für die API-GETs nach dem Login
+REQUEST_TIMEOUT = 30
+
+# Maximal so viele Bytes eines Fehler-Bodys landen in der Exception
+ERROR_BODY_LIMIT = 4096
+
+# Parallele Downloads/Webhooks – bewusst begrenzt, um die API nicht zu fluten
+DEFAULT_MAX_WORKERS = 6
+
+# Keep-Alive-Verbindungen pro Host; die API-Session wächst mit max_workers mit,
+# damit keine Verbindung nach Gebrauch verworfen wird
+HTTP_POOL_SIZE = 16
+
+# Gespeicherte Login-Session (Cookies + User-Agent). Bewusst nicht unter data/,
+# weil data/ als Artifact hochgeladen wird.
+DEFAULT_AUTH_STATE_FILE = ".auth_state.json"
+DEFAULT_AUTH_MAX_AGE_HOURS = 12
+
+# JSON kompakt speichern; APPCAST_PRETTY_JSON=1 rückt alle Dateien zum Lesen ein
+PRETTY_JSON = os.getenv("APPCAST_PRETTY_JSON") == "1"
+
 # Zustände, die du auch in den URLs hattest
-STATUSES = ["sponsored", "unsponsored", "expired", "aggregated", "suspended"]
+STATUSES = ("sponsored", "unsponsored", "expired", "aggregated", "suspended")
+
+# Subsysteme, die für ein Login-Formular nicht gebraucht werden
+# (--no-sandbox setzt Playwright ohnehin standardmäßig)
+CHROMIUM_LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+]
+
+# Ressourcen, die der Login-Browser nicht laden muss. Stylesheets bleiben erlaubt,
+# weil das zweistufige Formular Felder per CSS ein-/ausblendet.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
 
 # Frühestes Datum, ab dem Tagesdaten verfügbar sind
 EARLIEST_DAILY_DATE = datetime(2025, 11, 17).date()
+# Als ISO-String für schnelle Vergleiche (YYYY-MM-DD sortiert lexikografisch)
+EARLIEST_DAILY_DATE_STR = EARLIEST_DAILY_DATE.isoformat()
+
+
+def json_loads(data: bytes):
+    """JSON parsen – mit orjson, falls installiert, sonst mit der stdlib."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj, pretty: bool = False) -> bytes:
+    """JSON als UTF-8-Bytes serialisieren (kompakt oder mit indent=2)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# Bereits formatierte Floats – Reports wiederholen viele Werte (0, gleiche Beträge)
+_DE_FLOAT_CACHE: dict[float, str] = {}
+_DE_FLOAT_CACHE_MAX = 10_000
 
 
-def localize_decimals_for_de(obj):
+def format_number_de(value):
+    """
+    Formatiert eine Zahl mit deutschem Dezimaltrennzeichen, max. 2 Nachkommastellen.
+    bool und Nicht-Zahlen bleiben unverändert.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        # Ganzzahlen haben keine Nachkommastellen – kein Format-String nötig
+        return str(value)
+    if not isinstance(value, float):
+        return value
+
+    cached = _DE_FLOAT_CACHE.get(value)
+    if cached is not None:
+        return cached
+
+    # 2 Nachkommastellen, Trailing-Nullen optional abschneiden
+    s = f"{value:.2f}"
+    if "." in s:
+        s = s.rstrip("0").rstrip(".")
+    s = s.replace(".", ",")
+    # 0.0 und -0.0 sind als Schlüssel gleich, formatieren aber zu "0" bzw. "-0"
+    if value and len(_DE_FLOAT_CACHE) < _DE_FLOAT_CACHE_MAX:
+        _DE_FLOAT_CACHE[value] = s
+    return s
+
+
+def localize_decimals_for_de(obj, in_place: bool = False):
     """
     Konvertiert alle int/float-Werte in Strings mit deutschem Dezimaltrennzeichen.
     Beispiel: 5.83 -> "5,83"
 
     Wichtig:
-    - Struktur (Dicts/Listen) bleibt erhalten.
-    - Nur Zahlen werden verändert, alle anderen Typen bleiben unverändert.
+    - Struktur (Dicts/Listen) bleibt erhalten. Standardmäßig wird eine Kopie
+      gebaut; mit in_place=True werden die vorhandenen Container überschrieben
+      (spart bei großen Reports die zweite Kopie im Speicher).
+    - Nur Zahlen werden verändert, alle anderen Typen (auch bool) bleiben unverändert.
+    - Iterativ über einen expliziten Stack statt rekursiv.
     """
     if isinstance(obj, dict):
-        return {k: localize_decimals_for_de(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [localize_decimals_for_de(v) for v in obj]
-    if isinstance(obj, (int, float)):
-        # 2 Nachkommastellen, Trailing-Nullen optional abschneiden
-        s = f"{obj:.2f}"
-        if "." in s:
-            s = s.rstrip("0").rstrip(".")
-        return s.replace(".", ",")
-    return obj
+        result = obj if in_place else {}
+    elif isinstance(obj, list):
+        result = obj if in_place else [None] * len(obj)
+    else:
+        return format_number_de(obj)
+
+    # Geparstes JSON kennt nur exakte Basistypen – daher Dispatch über type(),
+    # die häufigsten Fälle (str, float aus dem Cache) ohne Funktionsaufruf.
+    float_cache = _DE_FLOAT_CACHE
+    stack = [(obj, result)]
+    while stack:
+        src, dst = stack.pop()
+        items = src.items() if isinstance(src, dict) else enumerate(src)
+        for key, value in items:
+            value_type = type(value)
+            if value_type is str:
+                if not in_place:
+                    dst[key] = value
+                continue
+            if value_type is float:
+                text = float_cache.get(value)
+                dst[key] = text if text is not None else format_number_de(value)
+                continue
+            if value_type is dict or (
+                value_type is not list and isinstance(value, dict)
+            ):
+                child = value if in_place else {}
+            elif isinstance(value, list):
+                child = value if in_place else [None] * len(value)
+            else:
+                dst[key] = format_number_de(value)
+                continue
+            dst[key] = child
+            stack.append((value, child))
+
+    return result
 
 
-def current_month_yyyy_mm() -> str:
-    """Gibt den aktuellen Monat im Format YYYY-MM zurück (basierend auf UTC)."""
-    today = datetime.utcnow()
-    return f"{today.year}-{today.month:02d}"
+def current_month_yyyy_mm(now: datetime) -> str:
+    """Gibt den Monat von now (UTC) im Format YYYY-MM zurück."""
+    return f"{now.year}-{now.month:02d}"
 
 
+@lru_cache(maxsize=4)
 def month_start_end(selected_month: str) -> tuple[str, str]:
     """Ermittelt ersten und letzten Tag des Monats im Format YYYY-MM-DD."""
+    import calendar
+
     year, month = map(int, selected_month.split("-"))
     last_day = calendar.monthrange(year, month)[1]
     start = f"{year}-{month:02d}-01"
@@ -56,22 +197,40 @@ def month_start_end(selected_month: str) -> tuple[str, str]:
     return start, end
 
 
-def last_calendar_week_range() -> tuple[str, str]:
+def last_calendar_week_range(now: datetime) -> tuple[date, date]:
     """
     Liefert die letzte vollständige Kalenderwoche (Montag–Sonntag)
-    relativ zu heute (UTC) als (start_date, end_date) im Format YYYY-MM-DD.
+    relativ zu now (UTC) als (start_date, end_date) – als date-Objekte,
+    damit Aufrufer nicht erneut parsen müssen.
 
     Beispiel: Aufruf am Montag, 2025-12-08
     → Ergebnis: 2025-12-01 (Mo) bis 2025-12-07 (So).
     """
-    today = datetime.utcnow().date()
+    today = now.date()
     this_monday = today - timedelta(days=today.weekday())  # 0 = Montag
     last_monday = this_monday - timedelta(days=7)
     last_sunday = this_monday - timedelta(days=1)
-    return last_monday.strftime("%Y-%m-%d"), last_sunday.strftime("%Y-%m-%d")
+    return last_monday, last_sunday
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Laufzeit-Konfiguration aus der Umgebung (siehe get_config)."""
 
+    email: str
+    password: str = field(repr=False)
+    employer_id: str
+    selected_month: str
+    job_board_ids: tuple[str, ...]
+    tiles_job_board_id: str
+    auth_state_file: Path
+    auth_max_age_hours: float
+    max_workers: int
+    hook_batch: bool
+    http_login: bool
 
-def get_config():
+
+def get_config(now: datetime) -> Config:
     email = os.getenv("APPCAST_EMAIL")
     password = os.getenv("APPCAST_PASSWORD")
 
@@ -84,23 +243,37 @@ def get_config():
     employer_id = os.getenv("APPCAST_EMPLOYER_ID", DEFAULT_EMPLOYER_ID)
     # Für hero_metrics / tiles_by_day weiterhin ein Monats-Parameter,
     # alle date-basierten Reports werden über period_start/period_end gesteuert.
-    selected_month = current_month_yyyy_mm()
+    selected_month = current_month_yyyy_mm(now)
 
     job_board_ids_raw = os.getenv("APPCAST_JOB_BOARD_IDS", "")
-    job_board_ids = [
+    job_board_ids = tuple(
         jb.strip() for jb in job_board_ids_raw.split(",") if jb.strip()
-    ]
+    )
 
     tiles_job_board_id = os.getenv("APPCAST_TILES_JOB_BOARD_ID", "")
 
-    return {
-        "email": email,
-        "password": password,
-        "employer_id": employer_id,
-        "selected_month": selected_month,
-        "job_board_ids": job_board_ids,
-        "tiles_job_board_id": tiles_job_board_id,
-    }
+    auth_state_file = Path(
+        os.getenv("APPCAST_AUTH_STATE_FILE", DEFAULT_AUTH_STATE_FILE)
+    )
+    auth_max_age_hours = float(
+        os.getenv("APPCAST_AUTH_MAX_AGE_HOURS", DEFAULT_AUTH_MAX_AGE_HOURS)
+    )
+
+    max_workers = max(1, int(os.getenv("APPCAST_MAX_WORKERS", DEFAULT_MAX_WORKERS)))
+
+    return Config(
+        email=email,
+        password=password,
+        employer_id=employer_id,
+        selected_month=selected_month,
+        job_board_ids=job_board_ids,
+        tiles_job_board_id=tiles_job_board_id,
+        auth_state_file=auth_state_file,
+        auth_max_age_hours=auth_max_age_hours,
+        max_workers=max_workers,
+        hook_batch=os.getenv("APPCAST_HOOK_BATCH") == "1",
+        http_login=os.getenv("APPCAST_HTTP_LOGIN") == "1",
+    )
 
 
 def build_common_report_params() -> dict:
@@ -122,6 +295,38 @@ def build_common_report_params() -> dict:
     }
 
 
+# Die gemeinsamen Parameter ändern sich nie – einmal pro Schlüssel kodieren,
+# statt sie für jeden Report zu kopieren und erneut zu urlencoden.
+_COMMON_QUERY_PARTS = {
+    key: urlencode({key: value}, doseq=True)
+    for key, value in build_common_report_params().items()
+}
+
+
+def build_query(params: dict, with_common: bool = False) -> str:
+    """
+    Kodiert params als Query-String. Mit with_common=True werden die
+    vorkodierten gemeinsamen Parameter vorangestellt; Schlüssel aus params
+    überschreiben dabei gleichnamige gemeinsame Parameter.
+    """
+    parts = []
+    if with_common:
+        parts.extend(
+            part for key, part in _COMMON_QUERY_PARTS.items() if key not in params
+        )
+    if params:
+        parts.append(urlencode(params, doseq=True))
+    return "&".join(parts)
+
+
+def block_unneeded_resources(route):
+    """Route-Handler: Bilder, Fonts und Medien für den Login abbrechen."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
 def login_with_playwright(pw, cfg):
     """
     Zweistufiger Login:
@@ -129,16 +334,21 @@ def login_with_playwright(pw, cfg):
     1) E-Mail eingeben, Log In klicken
     2) Passwortfeld abwarten, Passwort eingeben, erneut Log In klicken
     """
-    browser = pw.chromium.launch(headless=True)
+    browser = pw.chromium.launch(headless=True, args=CHROMIUM_LAUNCH_ARGS)
     context = browser.new_context()
+    context.route("**/*", block_unneeded_resources)
     page = context.new_page()
 
     print(f"Öffne Login-Seite: {LOGIN_URL}")
-    page.goto(LOGIN_URL, wait_until="networkidle")
+    # Nicht auf networkidle warten (Tracker/Beacons) – das E-Mail-Feld reicht
+    page.goto(LOGIN_URL, wait_until="domcontentloaded")
 
     # Schritt 1: E-Mail
+    print("Warte auf E-Mail-Feld …")
+    page.wait_for_selector("#user_session_email", timeout=15_000)
+
     print("Fülle E-Mail-Feld …")
-    page.fill("#user_session_email", cfg["email"])
+    page.fill("#user_session_email", cfg.email)
 
     print("Klicke ersten 'Log In' …")
     page.click("button.btn-login")
@@ -148,112 +358,434 @@ def login_with_playwright(pw, cfg):
     page.wait_for_selector("#user_session_password", timeout=30_000)
 
     print("Fülle Passwort-Feld …")
-    page.fill("#user_session_password", cfg["password"])
+    page.fill("#user_session_password", cfg.password)
+
+    # Warten, bis /api/info/user mit 200 kommt → sicher eingeloggt.
+    # expect_response hängt den Listener schon vor dem Klick an die Seite,
+    # sodass eine schnelle Response nicht verpasst wird.
+    print("Klicke zweiten 'Log In' und warte auf /api/info/user-Response …")
+    with page.expect_response(
+        lambda r: USER_INFO_PATH in r.url and r.status == 200,
+        timeout=30_000,
+    ):
+        page.click("button.btn-login")
+    print("Login erfolgreich.")
 
-    print("Klicke zweiten 'Log In' …")
-    page.click("button.btn-login")
+    return browser, context
 
-    # Warten, bis /api/info/user mit 200 kommt → sicher eingeloggt
-    def is_logged_in(response):
-        try:
-            return "/api/info/user" in response.url and response.status == 200
-        except Exception:
-            return False
 
-    print("Warte auf erfolgreiche /api/info/user-Response …")
-    context.wait_for_event("response", predicate=is_logged_in, timeout=30_000)
-    print("Login erfolgreich.")
+def new_http_session(pool_size: int = HTTP_POOL_SIZE) -> "requests.Session":
+    """
+    requests.Session mit Verbindungspool und Retries für https://.
+    TCP/TLS-Verbindungen werden per Keep-Alive über alle Requests wiederverwendet.
+    """
+    import requests  # API-Abrufe und Make-Webhook
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=2, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    return session
 
-    return browser, context
+
+@lru_cache(maxsize=1)
+def get_webhook_session() -> "requests.Session":
+    """Geteilte Session für den Make-Webhook (beim ersten Aufruf angelegt)."""
+    return new_http_session()
+
+
+def build_api_session(
+    state: dict, pool_size: int = HTTP_POOL_SIZE
+) -> "requests.Session":
+    """
+    Baut eine requests.Session mit Cookies und User-Agent aus einem
+    Playwright-storage_state (plus Schlüssel "user_agent").
+
+    Anders als Playwrights APIRequestContext ist die Session threadsicher genug
+    für parallele GETs und nutzt Keep-Alive statt des IPC-Umwegs über den
+    Playwright-Treiber.
+    """
+    session = new_http_session(pool_size)
+    for cookie in state.get("cookies", []):
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie["domain"],
+            path=cookie.get("path", "/"),
+        )
+
+    user_agent = state.get("user_agent")
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    return session
+
+
+def api_pool_size(cfg) -> int:
+    """Poolgröße der API-Session: mindestens eine Verbindung pro Worker."""
+    return max(HTTP_POOL_SIZE, cfg.max_workers)
+
+
+def is_session_valid(session) -> bool:
+    """Günstiger Probe-Request: liefert /api/info/user ohne Redirect ein 200?"""
+    import requests
+
+    try:
+        resp = session.get(
+            f"{BASE_URL}{USER_INFO_PATH}",
+            timeout=REQUEST_TIMEOUT,
+            allow_redirects=False,
+        )
+    except requests.RequestException as e:
+        print(f"Probe-Request fehlgeschlagen: {e}")
+        return False
+    return resp.status_code == 200
+
+
+def load_cached_session(cfg):
+    """
+    Lädt die gespeicherte Login-Session, sofern sie existiert, nicht älter als
+    auth_max_age_hours ist und der Probe-Request noch durchgeht.
+    Gibt sonst None zurück.
+    """
+    state_file = cfg.auth_state_file
+    if not state_file.exists():
+        return None
+
+    age_hours = (time.time() - state_file.stat().st_mtime) / 3600
+    if age_hours > cfg.auth_max_age_hours:
+        print(
+            f"Gespeicherte Session ist {age_hours:.1f}h alt "
+            f"(max. {cfg.auth_max_age_hours}h) – neuer Login nötig."
+        )
+        return None
+
+    try:
+        with state_file.open(encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Gespeicherte Session nicht lesbar ({e}) – neuer Login nötig.")
+        return None
+
+    session = build_api_session(state, api_pool_size(cfg))
+    if not is_session_valid(session):
+        print("Gespeicherte Session ist abgelaufen – neuer Login nötig.")
+        session.close()
+        return None
+
+    print(f"Verwende gespeicherte Session aus {state_file}.")
+    return session
+
+
+def login_with_requests(cfg):
+    """
+    Login ohne Browser: Login-Seite laden, CSRF-Token auslesen und E-Mail +
+    Passwort in einem POST abschicken.
+
+    Gibt None zurück, wenn das Formular nicht wie erwartet aussieht oder der
+    Probe-Request danach nicht durchgeht – dann übernimmt login_with_playwright.
+    Die Zugangsdaten gehen nur an eine Form-Action auf BASE_URL.
+    """
+    import requests
+
+    session = new_http_session(api_pool_size(cfg))
+    try:
+        print(f"Versuche Login per HTTP: {LOGIN_URL}")
+        resp = session.get(LOGIN_URL, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+
+        token_match = CSRF_TOKEN_RE.search(resp.text)
+        if token_match is None:
+            print("Kein CSRF-Token auf der Login-Seite gefunden.")
+            session.close()
+            return None
+
+        login_form = next(
+            (
+                m
+                for m in FORM_RE.finditer(resp.text)
+                if "user_session[" in m.group(2)
+            ),
+            None,
+        )
+        if login_form is None:
+            print("Kein Login-Formular mit user_session-Feldern gefunden.")
+            session.close()
+            return None
+
+        action_match = FORM_ACTION_RE.search(login_form.group(1))
+        post_url = (
+            urljoin(LOGIN_URL, html.unescape(action_match.group(1)))
+            if action_match
+            else LOGIN_URL
+        )
+        if urlsplit(post_url)[:2] != urlsplit(BASE_URL)[:2]:
+            print(f"Form-Action zeigt nicht auf {BASE_URL} – kein Login per HTTP.")
+            session.close()
+            return None
+
+        session.post(
+            post_url,
+            data={
+                "authenticity_token": html.unescape(token_match.group(1)),
+                "user_session[email]": cfg.email,
+                "user_session[password]": cfg.password,
+            },
+            timeout=REQUEST_TIMEOUT,
+        )
+    except requests.RequestException as e:
+        print(f"Login per HTTP fehlgeschlagen: {e}")
+        session.close()
+        return None
+
+    if not is_session_valid(session):
+        print("Login per HTTP nicht bestätigt.")
+        session.close()
+        return None
+
+    print("Login per HTTP erfolgreich.")
+    return session
+
+
+def save_auth_state(cfg, state: dict):
+    """Speichert Cookies + User-Agent (nur für den Besitzer lesbar)."""
+    state_file = cfg.auth_state_file
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    # Direkt mit 0o600 anlegen, damit die Cookies nie kurz für andere lesbar
+    # sind; chmod zieht die Rechte einer schon vorhandenen Datei nach
+    fd = os.open(state_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    state_file.chmod(0o600)
+    print(f"Session gespeichert unter: {state_file.resolve()}")
+
+
+def get_api_session(cfg):
+    """
+    Liefert eine eingeloggte requests.Session. Reihenfolge:
+
+    1) gespeicherte Session, sofern noch gültig
+    2) Login per HTTP (CSRF-Formular, ohne Browser) – nur mit
+       APPCAST_HTTP_LOGIN=1, da der Formular-Vertrag nicht garantiert ist und
+       ein fehlschlagender POST als Fehlversuch am Konto zählen kann
+    3) zweistufiger Login per Playwright als Fallback
+
+    Nach einem neuen Login wird die Session für spätere Runs gespeichert.
+    """
+    session = load_cached_session(cfg)
+    if session is not None:
+        return session
+
+    session = login_with_requests(cfg) if cfg.http_login else None
+    if session is not None:
+        save_auth_state(
+            cfg,
+            {
+                "cookies": [
+                    {
+                        "name": c.name,
+                        "value": c.value,
+                        "domain": c.domain,
+                        "path": c.path,
+                    }
+                    for c in session.cookies
+                ],
+                "user_agent": session.headers.get("User-Agent"),
+            },
+        )
+        return session
+
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as pw:
+        browser, context = login_with_playwright(pw, cfg)
+        state = context.storage_state()
+        state["user_agent"] = context.pages[0].evaluate("navigator.userAgent")
+        # Ab hier reichen die Cookies – Chromium sofort wieder freigeben
+        browser.close()
+
+    save_auth_state(cfg, state)
+    return build_api_session(state, api_pool_size(cfg))
 
 
 def fetch_and_save(
-    api_context,
+    session,
     url_path: str,
     params: dict,
     out_file: Path,
     postprocess=None,
+    parse: bool = False,
+    with_common: bool = False,
 ):
     """
     Hilfsfunktion: Request bauen, GET ausführen, JSON (optional transformiert) speichern.
-    Gibt die (ggf. postprozessierten) Daten zurück.
+
+    Ohne postprocess (und ohne APPCAST_PRETTY_JSON) wird die Antwort unverändert
+    auf die Platte geschrieben – kein Parsen, kein erneutes Serialisieren.
+    Geparst wird nur, wenn ein postprocess gesetzt ist oder der Aufrufer die
+    Daten per parse=True braucht.
+    Mit with_common=True kommen die gemeinsamen Report-Parameter dazu.
+
+    Liegt die Datei samt ETag (<out_file>.etag) schon vor, wird per If-None-Match
+    angefragt; bei 304 bleibt die vorhandene Datei unverändert.
+    Gibt die (ggf. postprozessierten) Daten zurück, sonst None.
     """
-    query = urlencode(params, doseq=True)
+    query = build_query(params, with_common)
     full_url = f"{url_path}?{query}" if query else url_path
 
-    print(f"GET {full_url}")
-    resp = api_context.get(full_url)
-    if not resp.ok:
-        text = resp.text()
-        raise RuntimeError(
-            f"Request fehlgeschlagen: {resp.status} {resp.status_text()}\n{text}"
-        )
+    etag_file = out_file.with_name(f"{out_file.name}.etag")
+    headers = {}
+    if out_file.exists() and etag_file.exists():
+        headers["If-None-Match"] = etag_file.read_text(encoding="utf-8").strip()
+
+    with session.get(
+        f"{BASE_URL}{full_url}",
+        headers=headers,
+        timeout=REQUEST_TIMEOUT,
+        stream=True,
+    ) as resp:
+        print(f"GET {resp.url} → HTTP {resp.status_code}")
+        if resp.status_code == 304:
+            print(f"Unverändert, behalte: {out_file.resolve()}")
+            if postprocess is None and not parse:
+                return None
+            return json_loads(out_file.read_bytes())
+
+        if not resp.ok:
+            # Nur den Anfang des Bodys lesen – Fehlerseiten können riesig sein
+            snippet = next(resp.iter_content(ERROR_BODY_LIMIT), b"")
+            content_length = resp.headers.get("Content-Length", "?")
+            raise RuntimeError(
+                f"Request fehlgeschlagen: {resp.status_code} {resp.reason} "
+                f"(Content-Length: {content_length})\n"
+                f"{snippet.decode('utf-8', 'replace')}"
+            )
+
+        content_type = resp.headers.get("Content-Type", "")
+        if "json" not in content_type:
+            raise RuntimeError(
+                f"Unerwarteter Content-Type '{content_type}' für {resp.url}"
+            )
 
-    data = resp.json()
+        etag = resp.headers.get("ETag")
+        # Alten ETag vor dem Schreiben entfernen: bricht der Download ab, darf
+        # die angeschnittene Datei beim nächsten Lauf nicht per 304 bestehen bleiben
+        etag_file.unlink(missing_ok=True)
+
+        if postprocess is not None or PRETTY_JSON:
+            data = json_loads(resp.content)
+            if postprocess is not None:
+                data = postprocess(data)
+            out_file.write_bytes(json_dumps(data, pretty=PRETTY_JSON))
+        elif parse:
+            body = resp.content
+            out_file.write_bytes(body)
+            data = json_loads(body)
+        else:
+            # Rohbytes direkt in die Datei streamen (gzip wird dabei entpackt)
+            resp.raw.decode_content = True
+            with out_file.open("wb") as f:
+                shutil.copyfileobj(resp.raw, f)
+            data = None
 
-    if postprocess is not None:
-        data = postprocess(data)
+    # Neuen ETag erst nach erfolgreichem Schreiben ablegen
+    if etag:
+        etag_file.write_text(etag, encoding="utf-8")
 
-    out_file.parent.mkdir(parents=True, exist_ok=True)
-    out_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
     print(f"Gespeichert unter: {out_file.resolve()}")
-
     return data
 
 
-def filter_tiles_by_day_from_earliest(data):
+@dataclass(frozen=True, slots=True)
+class ReportSpec:
     """
-    Filtert tiles_by_day-Daten so, dass nur Einträge mit date >= EARLIEST_DAILY_DATE
-    übrig bleiben.
+    Ein abzurufender Report – Argumente für fetch_and_save als Daten.
+    webhook enthält die Meta-Felder für send_report_to_webhook (report_type,
+    start_date, …); Reports mit webhook werden dafür geparst.
     """
 
-    def parse_date(value: str):
-        try:
-            # Schneide ggf. Zeitanteil ab
-            return datetime.strptime(value[:10], "%Y-%m-%d").date()
-        except Exception:
-            return None
+    name: str
+    url_path: str
+    params: dict
+    out_file: Path
+    postprocess: Callable | None = None
+    with_common: bool = False
+    webhook: dict | None = None
+
+
+def fetch_report(session, spec: ReportSpec):
+    """fetch_and_save für eine ReportSpec."""
+    return fetch_and_save(
+        session,
+        spec.url_path,
+        spec.params,
+        spec.out_file,
+        postprocess=spec.postprocess,
+        parse=spec.webhook is not None,
+        with_common=spec.with_common,
+    )
+
 
+@lru_cache(maxsize=1024)
+def is_valid_date_str(value: str) -> bool:
+    """Ist value ein gültiges Datum YYYY-MM-DD? Gecacht, Tage wiederholen sich."""
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+
+def filter_entries_from_earliest(entries: list, label: str) -> list:
+    """
+    Entfernt aus einer Liste alle Dicts mit "date" vor EARLIEST_DAILY_DATE.
+    Einträge ohne "date" bleiben erhalten, Dicts mit ungültigem Datum fliegen raus.
+
+    Ein Durchlauf: zuerst der billige String-Vergleich auf den ersten 10 Zeichen
+    (ISO-Daten sortieren lexikografisch), nur Treffer werden noch per
+    is_valid_date_str geprüft.
+    """
+    filtered = [
+        item
+        for item in entries
+        if not isinstance(item, dict)
+        or "date" not in item
+        or (
+            isinstance(value := item["date"], str)
+            and (day := value[:10]) >= EARLIEST_DAILY_DATE_STR
+            and is_valid_date_str(day)
+        )
+    ]
+    print(
+        f"{label}: Filter auf >= {EARLIEST_DAILY_DATE}, "
+        f"{len(entries)} → {len(filtered)} Einträge"
+    )
+    return filtered
+
+
+def filter_tiles_by_day_from_earliest(data):
+    """
+    Filtert tiles_by_day-Daten so, dass nur Einträge mit date >= EARLIEST_DAILY_DATE
+    übrig bleiben – entweder in einer Top-Level-Liste oder in allen
+    datumsbehafteten Listen eines Top-Level-Dicts.
+    """
     # Fall 1: Top-Level-Liste
     if isinstance(data, list):
-        filtered = []
-        for item in data:
-            if isinstance(item, dict) and "date" in item:
-                d = parse_date(item.get("date", ""))
-                if d and d >= EARLIEST_DAILY_DATE:
-                    filtered.append(item)
-            else:
-                filtered.append(item)
-        print(
-            f"tiles_by_day: Filter auf >= {EARLIEST_DAILY_DATE}, "
-            f"{len(data)} → {len(filtered)} Einträge"
-        )
-        return filtered
+        return filter_entries_from_earliest(data, "tiles_by_day")
 
-    # Fall 2: Top-Level-Dict mit Liste(n)
+    # Fall 2: Top-Level-Dict mit Liste(n); Werte bestehender Schlüssel zu
+    # ersetzen ist während der Iteration erlaubt
     if isinstance(data, dict):
-        modified = False
-        for key, val in list(data.items()):
-            if isinstance(val, list) and val:
-                sample = next((v for v in val if isinstance(v, dict)), None)
-                if sample and "date" in sample:
-                    original_len = len(val)
-                    new_list = []
-                    for item in val:
-                        if isinstance(item, dict) and "date" in item:
-                            d = parse_date(item.get("date", ""))
-                            if d and d >= EARLIEST_DAILY_DATE:
-                                new_list.append(item)
-                        else:
-                            new_list.append(item)
-                    data[key] = new_list
-                    modified = True
-                    print(
-                        f"tiles_by_day[{key}]: Filter auf >= {EARLIEST_DAILY_DATE}, "
-                        f"{original_len} → {len(new_list)} Einträge"
-                    )
-        if modified:
-            return data
+        for key, val in data.items():
+            if not isinstance(val, list):
+                continue
+            sample = next((v for v in val if isinstance(v, dict)), None)
+            if sample is not None and "date" in sample:
+                data[key] = filter_entries_from_earliest(val, f"tiles_by_day[{key}]")
 
     return data
 
@@ -271,289 +803,361 @@ def get_appcast_hook_url() -> str | None:
     return None
 
 
-def send_report_to_webhook(
+def build_webhook_payload(
     employer_id: str,
     selected_month: str,
     start_date: str,
     end_date: str,
     report_type: str,
     report: dict,
+    timestamp_utc: str,
     **extra_meta,
-):
+) -> dict:
     """
-    Generischer Webhook-Sender für verschiedene Reporttypen.
+    Baut den Webhook-Payload für einen Report.
 
-    Beispiele:
-    - report_type="by_day"
-    - report_type="by_dynamic_field", dynamic_field="title"
-    - report_type="by_dynamic_field", dynamic_field="city"
-
-    Alle Zahlen werden vor dem Senden in deutsche Schreibweise konvertiert
-    (5.83 → "5,83"), damit sie in Google Sheets / Make als Strings mit Komma ankommen.
+    Alle Zahlen werden in deutsche Schreibweise konvertiert (5.83 → "5,83"),
+    damit sie in Google Sheets / Make als Strings mit Komma ankommen.
+    Das geschieht in-place: report gehört danach dem Payload und wird nicht
+    ein zweites Mal im Speicher aufgebaut.
     """
-    hook_url = get_appcast_hook_url()
-    if not hook_url:
-        print("Kein appcast_hook / APPCAST_HOOK gesetzt – Webhook wird übersprungen.")
-        return
-
-    localized_report = localize_decimals_for_de(report)
-
     payload = {
         "employer_id": employer_id,
         "selected_month": selected_month,
         "start_date": start_date,
         "end_date": end_date,
         "report_type": report_type,
-        "timestamp_utc": datetime.utcnow().isoformat(),
-        "report": localized_report,
+        "timestamp_utc": timestamp_utc,
+        "report": localize_decimals_for_de(report, in_place=True),
     }
     payload.update(extra_meta)
+    return payload
+
 
-    print(f"Sende Report '{report_type}' an Webhook {hook_url} …")
+def post_to_webhook(hook_url: str, payload: dict, label: str):
+    """POST eines JSON-Payloads an den Webhook; Fehler werden nur geloggt."""
+    print(f"Sende {label} an Webhook {hook_url} …")
     try:
-        resp = requests.post(hook_url, json=payload, timeout=20)
+        resp = get_webhook_session().post(
+            hook_url,
+            data=json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=20,
+        )
         resp.raise_for_status()
         print(f"Webhook erfolgreich: HTTP {resp.status_code}")
     except Exception as e:
         print(f"Fehler beim Senden an Webhook: {e}")
 
 
-def fetch_all_reports(cfg, period_start: str, period_end: str):
+def send_report_to_webhook(**report_meta):
     """
-    Holt alle Reports für einen beliebigen Datumsbereich period_start/period_end
-    (YYYY-MM-DD). Typischer Use Case hier: letzte Kalenderwoche (Mo–So).
-    hero_metrics / tiles_by_day bleiben monatsbasiert.
+    Generischer Webhook-Sender für verschiedene Reporttypen
+    (Argumente wie build_webhook_payload).
+
+    Beispiele:
+    - report_type="by_day"
+    - report_type="by_dynamic_field", dynamic_field="title"
+    - report_type="by_dynamic_field", dynamic_field="city"
     """
-    selected_month = cfg["selected_month"]
-    employer_id = cfg["employer_id"]
+    hook_url = get_appcast_hook_url()
+    if not hook_url:
+        print("Kein appcast_hook / APPCAST_HOOK gesetzt – Webhook wird übersprungen.")
+        return
 
-    # Jahr anhand des Enddatums bestimmen (für Jahres-Reports)
-    year = period_end.split("-")[0]
-    year_start = f"{year}-1-1"
-    year_end = f"{year}-12-31"
+    payload = build_webhook_payload(**report_meta)
+    post_to_webhook(hook_url, payload, f"Report '{payload['report_type']}'")
 
-    period_label = f"{period_start}_to_{period_end}"
 
-    with sync_playwright() as pw:
-        browser, context = login_with_playwright(pw, cfg)
+def send_reports_batch(hook_url: str, reports: list[dict]):
+    """
+    Schickt mehrere fertige Payloads (siehe build_webhook_payload) in einem
+    einzigen POST als {"reports": [...]} – ein Roundtrip statt einer pro Report.
+    Erfordert ein Make-Szenario, das dieses Format erwartet (APPCAST_HOOK_BATCH=1).
+    """
+    post_to_webhook(hook_url, {"reports": reports}, f"{len(reports)} Reports gebündelt")
 
-        state = context.storage_state()
-        api_context = pw.request.new_context(
-            base_url=BASE_URL,
-            storage_state=state,
-        )
 
-        out_dir = Path("data")
+def build_report_specs(
+    cfg, period_start: date, period_end: date, out_dir: Path
+) -> list[ReportSpec]:
+    """
+    Beschreibt alle Reports für den Datumsbereich period_start/period_end
+    als ReportSpecs. hero_metrics / tiles_by_day bleiben monatsbasiert.
+    Reine Datenaufbereitung – kein Netzwerkzugriff.
+    """
+    selected_month = cfg.selected_month
+    employer_id = cfg.employer_id
 
-        # 1) hero_metrics (monatsbasiert, weiterhin aktueller Monat)
-        hero_params = {
-            "selected_month": selected_month,
-            "devise": "all",
-            "publisher_type": "all",
-            "traffic": "all_wo_organic",
-            "channel_type": "programmatic",
-            "job_group_stats_source": "data",
-        }
-        fetch_and_save(
-            api_context,
-            f"/api/reports/employer/{employer_id}/hero_metrics",
-            hero_params,
-            out_dir / f"hero_metrics_{selected_month}.json",
-        )
+    # Jahr anhand des Enddatums bestimmen (für Jahres-Reports)
+    year = period_end.year
+    year_start = f"{year}-1-1"
+    year_end = f"{year}-12-31"
 
-        # Gemeinsame Basis für weitere Reports
-        common = build_common_report_params()
+    # Als YYYY-MM-DD nur dort, wo Strings gebraucht werden (Parameter, Dateinamen)
+    start_date = period_start.isoformat()
+    end_date = period_end.isoformat()
+    period_label = f"{start_date}_to_{end_date}"
+    reports_path = f"/api/reports/employer/{employer_id}"
 
+    reports = [
+        # 1) hero_metrics (monatsbasiert, weiterhin aktueller Monat)
+        ReportSpec(
+            name="hero_metrics",
+            url_path=f"{reports_path}/hero_metrics",
+            params={
+                "selected_month": selected_month,
+                "devise": "all",
+                "publisher_type": "all",
+                "traffic": "all_wo_organic",
+                "channel_type": "programmatic",
+                "job_group_stats_source": "data",
+            },
+            out_file=out_dir / f"hero_metrics_{selected_month}.json",
+        ),
         # 2) by_month (Jahresübersicht für das Jahr des Enddatums)
-        by_month_params = {
-            **common,
-            "start_month": year_start,
-            "end_month": year_end,
-        }
-        fetch_and_save(
-            api_context,
-            f"/api/reports/employer/{employer_id}/by_month",
-            by_month_params,
-            out_dir / f"by_month_{year}.json",
-        )
-
+        ReportSpec(
+            name="by_month",
+            url_path=f"{reports_path}/by_month",
+            params={
+                "start_month": year_start,
+                "end_month": year_end,
+            },
+            out_file=out_dir / f"by_month_{year}.json",
+            with_common=True,
+        ),
         # 3) by_dynamic_field (tagged_category_id, Zeitraum period_start–period_end)
-        by_dyn_params = {
-            **common,
-            "pjg": "false",
-            "start_month": year_start,
-            "end_month": year_end,
-            "dynamic_field": "tagged_category_id",
-            "start_date": period_start,
-            "end_date": period_end,
-            "per_page": 100,
-        }
-        fetch_and_save(
-            api_context,
-            f"/api/reports/employer/{employer_id}/by_dynamic_field",
-            by_dyn_params,
-            out_dir
+        ReportSpec(
+            name="by_dynamic_field_tagged_category",
+            url_path=f"{reports_path}/by_dynamic_field",
+            params={
+                "pjg": "false",
+                "start_month": year_start,
+                "end_month": year_end,
+                "dynamic_field": "tagged_category_id",
+                "start_date": start_date,
+                "end_date": end_date,
+                "per_page": 100,
+            },
+            out_file=out_dir
             / f"by_dynamic_field_tagged_category_{period_label}.json",
-        )
-
+            with_common=True,
+        ),
         # 3b) by_dynamic_field (title, Zeitraum period_start–period_end, sortiert nach Spend)
-        by_dyn_title_params = {
-            **common,
-            "pjg": "false",
-            "selected_month": selected_month,
-            "dynamic_field": "title",
-            "start_date": period_start,
-            "end_date": period_end,
-            "per_page": 100,
-            "job_group_status": "all",
-            "sort": "spent-desc",
-        }
-        by_dyn_title_data = fetch_and_save(
-            api_context,
-            f"/api/reports/employer/{employer_id}/by_dynamic_field",
-            by_dyn_title_params,
-            out_dir / f"by_dynamic_field_title_{period_label}.json",
+        ReportSpec(
+            name="by_dynamic_field_title",
+            url_path=f"{reports_path}/by_dynamic_field",
+            params={
+                "pjg": "false",
+                "selected_month": selected_month,
+                "dynamic_field": "title",
+                "start_date": start_date,
+                "end_date": end_date,
+                "per_page": 100,
+                "job_group_status": "all",
+                "sort": "spent-desc",
+            },
+            out_file=out_dir / f"by_dynamic_field_title_{period_label}.json",
+            with_common=True,
+            # Webhook mit lokalisierter Dezimalschreibweise
+            webhook={
+                "start_date": start_date,
+                "end_date": end_date,
+                "report_type": "by_dynamic_field",
+                "dynamic_field": "title",
+            },
+        ),
+        # 3c) by_dynamic_field (city, Zeitraum period_start–period_end, sortiert nach Spend)
+        ReportSpec(
+            name="by_dynamic_field_city",
+            url_path=f"{reports_path}/by_dynamic_field",
+            params={
+                "pjg": "false",
+                "selected_month": selected_month,
+                "dynamic_field": "city",
+                "start_date": start_date,
+                "end_date": end_date,
+                "per_page": 100,
+                "job_group_status": "all",
+                "sort": "spent-desc",
+            },
+            out_file=out_dir / f"by_dynamic_field_city_{period_label}.json",
+            with_common=True,
+            # Webhook mit lokalisierter Dezimalschreibweise
+            webhook={
+                "start_date": start_date,
+                "end_date": end_date,
+                "report_type": "by_dynamic_field",
+                "dynamic_field": "city",
+            },
+        ),
+        # 4) by_week (Zeitraum period_start–period_end, typischerweise eine Woche)
+        ReportSpec(
+            name="by_week",
+            url_path=f"{reports_path}/by_week",
+            params={
+                "start_date": start_date,
+                "end_date": end_date,
+            },
+            out_file=out_dir / f"by_week_{period_label}.json",
+            with_common=True,
+        ),
+    ]
+
+    # 5) by_day (Zeitraum period_start–period_end, aber frühestens ab EARLIEST_DAILY_DATE)
+    daily_start_dt = max(period_start, EARLIEST_DAILY_DATE)
+
+    if daily_start_dt <= period_end:
+        daily_start = daily_start_dt.isoformat()
+        daily_end = end_date
+        daily_label = f"{daily_start}_to_{daily_end}"
+
+        reports.append(
+            ReportSpec(
+                name="by_day",
+                url_path=f"{reports_path}/by_day",
+                params={
+                    "start_date": daily_start,
+                    "end_date": daily_end,
+                },
+                out_file=out_dir / f"by_day_{daily_label}.json",
+                with_common=True,
+                # Webhook mit by_day-Report (mit DE-Lokalisierung)
+                webhook={
+                    "start_date": daily_start,
+                    "end_date": daily_end,
+                    "report_type": "by_day",
+                },
+            )
+        )
+    else:
+        print(
+            f"Überspringe by_day: Zeitraum {period_start} bis {period_end} "
+            f"liegt vollständig vor dem Startdatum für Tagesdaten "
+            f"({EARLIEST_DAILY_DATE})."
         )
 
-        # 3c) by_dynamic_field (city, Zeitraum period_start–period_end, sortiert nach Spend)
-        by_dyn_city_params = {
-            **common,
-            "pjg": "false",
-            "selected_month": selected_month,
-            "dynamic_field": "city",
-            "start_date": period_start,
-            "end_date": period_end,
-            "per_page": 100,
-            "job_group_status": "all",
-            "sort": "spent-desc",
-        }
-        by_dyn_city_data = fetch_and_save(
-            api_context,
-            f"/api/reports/employer/{employer_id}/by_dynamic_field",
-            by_dyn_city_params,
-            out_dir / f"by_dynamic_field_city_{period_label}.json",
+    # 6) by_source_index (job_board-spezifisch, Zeitraum period_start–period_end)
+    source_params = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "status[]": STATUSES,
+        "traffic": "all",
+        "job_group_stats_source": "data",
+    }
+    if cfg.job_board_ids:
+        # job_boards[]=ac-571&job_boards[]=...
+        source_params["job_boards[]"] = cfg.job_board_ids
+
+    reports.append(
+        ReportSpec(
+            name="by_source_index",
+            url_path=f"{reports_path}/by_source_index",
+            params=source_params,
+            out_file=out_dir / f"by_source_index_{period_label}.json",
         )
+    )
 
-        # 4) by_week (Zeitraum period_start–period_end, typischerweise eine Woche)
-        by_week_params = {
-            **common,
-            "start_date": period_start,
-            "end_date": period_end,
-        }
-        fetch_and_save(
-            api_context,
-            f"/api/reports/employer/{employer_id}/by_week",
-            by_week_params,
-            out_dir / f"by_week_{period_label}.json",
+    # 7) tiles_by_day (Dashboard-Kacheln pro Tag – weiterhin monatsbasiert)
+    tiles_params = {
+        "selected_month": selected_month,
+        "job_board_id": cfg.tiles_job_board_id,
+    }
+    # Tage vor EARLIEST_DAILY_DATE gar nicht erst laden (wie bei by_day);
+    # filter_tiles_by_day_from_earliest bleibt als Fallback, falls die API
+    # start_date/end_date ignoriert.
+    month_start, month_end = month_start_end(selected_month)
+    tiles_start = max(month_start, EARLIEST_DAILY_DATE_STR)
+    if tiles_start <= month_end:
+        tiles_params["start_date"] = tiles_start
+        tiles_params["end_date"] = month_end
+
+    reports.append(
+        ReportSpec(
+            name="tiles_by_day",
+            url_path=f"/api/dashboards/employer/{employer_id}/tiles_by_day",
+            params=tiles_params,
+            out_file=out_dir / f"tiles_by_day_{selected_month}.json",
+            postprocess=filter_tiles_by_day_from_earliest,
         )
+    )
 
-        # 5) by_day (Zeitraum period_start–period_end, aber frühestens ab EARLIEST_DAILY_DATE)
-        period_start_dt = datetime.strptime(period_start, "%Y-%m-%d").date()
-        period_end_dt = datetime.strptime(period_end, "%Y-%m-%d").date()
+    return reports
 
-        daily_start_dt = max(period_start_dt, EARLIEST_DAILY_DATE)
-        daily_end_dt = period_end_dt
 
-        if daily_start_dt <= daily_end_dt:
-            daily_start = daily_start_dt.strftime("%Y-%m-%d")
-            daily_end = daily_end_dt.strftime("%Y-%m-%d")
-            daily_label = f"{daily_start}_to_{daily_end}"
+def fetch_all_reports(cfg, period_start: date, period_end: date, now: datetime):
+    """
+    Holt alle Reports für einen beliebigen Datumsbereich
+    period_start/period_end. Typischer Use Case hier: letzte Kalenderwoche
+    (Mo–So).
 
-            by_day_params = {
-                **common,
-                "start_date": daily_start,
-                "end_date": daily_end,
-            }
-            by_day_path = out_dir / f"by_day_{daily_label}.json"
-            by_day_data = fetch_and_save(
-                api_context,
-                f"/api/reports/employer/{employer_id}/by_day",
-                by_day_params,
-                by_day_path,
-            )
+    Die Reports sind voneinander unabhängig und werden parallel geladen;
+    jeder Webhook startet, sobald sein Report vorliegt. now (UTC) ist der
+    Startzeitpunkt des Laufs und landet als timestamp_utc in den Webhooks.
+    """
+    out_dir = Path("data")
+    # Einmal anlegen – fetch_and_save schreibt nur noch in bestehende Verzeichnisse
+    out_dir.mkdir(parents=True, exist_ok=True)
 
-            # Webhook mit by_day-Report (mit DE-Lokalisierung) triggern
-            send_report_to_webhook(
-                employer_id=employer_id,
-                selected_month=selected_month,
-                start_date=daily_start,
-                end_date=daily_end,
-                report_type="by_day",
-                report=by_day_data,
-            )
-        else:
-            print(
-                f"Überspringe by_day: Zeitraum {period_start} bis {period_end} "
-                f"liegt vollständig vor dem Startdatum für Tagesdaten "
-                f"({EARLIEST_DAILY_DATE})."
-            )
+    reports = build_report_specs(cfg, period_start, period_end, out_dir)
 
-        # Webhook für by_dynamic_field(title) – mit lokalisierter Dezimalschreibweise
-        send_report_to_webhook(
-            employer_id=employer_id,
-            selected_month=selected_month,
-            start_date=period_start,
-            end_date=period_end,
-            report_type="by_dynamic_field",
-            report=by_dyn_title_data,
-            dynamic_field="title",
-        )
+    # Im Batch-Modus die Hook-URL einmal vorab prüfen – ohne URL werden die
+    # Payloads gar nicht erst gebaut (und die Reports nicht lokalisiert)
+    batch_hook_url = None
+    if cfg.hook_batch:
+        batch_hook_url = get_appcast_hook_url()
+        if not batch_hook_url:
+            print("Kein appcast_hook / APPCAST_HOOK gesetzt – Webhook wird übersprungen.")
 
-        # Webhook für by_dynamic_field(city) – mit lokalisierter Dezimalschreibweise
-        send_report_to_webhook(
-            employer_id=employer_id,
-            selected_month=selected_month,
-            start_date=period_start,
-            end_date=period_end,
-            report_type="by_dynamic_field",
-            report=by_dyn_city_data,
-            dynamic_field="city",
-        )
+    session = get_api_session(cfg)
 
-        # 6) by_source_index (job_board-spezifisch, Zeitraum period_start–period_end)
-        source_params = {
-            "start_date": period_start,
-            "end_date": period_end,
-            "status[]": STATUSES,
-            "traffic": "all",
-            "job_group_stats_source": "data",
+    with ThreadPoolExecutor(max_workers=cfg.max_workers) as executor:
+        futures = {
+            executor.submit(fetch_report, session, spec): spec for spec in reports
         }
-        if cfg["job_board_ids"]:
-            # job_boards[]=ac-571&job_boards[]=...
-            source_params["job_boards[]"] = cfg["job_board_ids"]
-
-        fetch_and_save(
-            api_context,
-            f"/api/reports/employer/{employer_id}/by_source_index",
-            source_params,
-            out_dir / f"by_source_index_{period_label}.json",
-        )
 
-        # 7) tiles_by_day (Dashboard-Kacheln pro Tag – weiterhin monatsbasiert)
-        tiles_params = {
-            "selected_month": selected_month,
-            "job_board_id": cfg["tiles_job_board_id"],
-        }
-        fetch_and_save(
-            api_context,
-            f"/api/dashboards/employer/{employer_id}/tiles_by_day",
-            tiles_params,
-            out_dir / f"tiles_by_day_{selected_month}.json",
-            postprocess=filter_tiles_by_day_from_earliest,
-        )
+        # Sobald ein Report da ist, seinen Webhook im Pool abschicken, während
+        # die übrigen Downloads weiterlaufen. Fehler einzelner Reports brechen ab;
+        # der with-Block wartet beim Verlassen auf alle noch laufenden Tasks.
+        # Mit APPCAST_HOOK_BATCH=1 werden die Payloads stattdessen gesammelt
+        # und am Ende in einem einzigen POST verschickt.
+        batch = []
+        for future in as_completed(futures):
+            data = future.result()
+            webhook = futures[future].webhook
+            if webhook is None:
+                continue
+
+            report_meta = {
+                "employer_id": cfg.employer_id,
+                "selected_month": cfg.selected_month,
+                "timestamp_utc": now.isoformat(),
+                "report": data,
+                **webhook,
+            }
+            if cfg.hook_batch:
+                if batch_hook_url:
+                    batch.append(build_webhook_payload(**report_meta))
+            else:
+                executor.submit(send_report_to_webhook, **report_meta)
 
-        api_context.dispose()
-        browser.close()
+    if batch:
+        send_reports_batch(batch_hook_url, batch)
+
+    session.close()
 
 
 def main():
-    cfg = get_config()
-    period_start, period_end = last_calendar_week_range()
+    # Einmal die Uhr lesen – Monat, Kalenderwoche und Webhook-Zeitstempel
+    # beziehen sich so garantiert auf denselben Zeitpunkt
+    now = datetime.now(timezone.utc)
+    cfg = get_config(now)
+    period_start, period_end = last_calendar_week_range(now)
     print(
-        f"Starte Appcast-Scraper für Employer {cfg['employer_id']} "
+        f"Starte Appcast-Scraper für Employer {cfg.employer_id} "
         f"für Zeitraum {period_start} bis {period_end} (letzte Kalenderwoche Mo–So)…"
     )
-    fetch_all_reports(cfg, period_start, period_end)
+    fetch_all_reports(cfg, period_start, period_end, now)
 
 
 if __name__ == "__main__":